@@ -3,16 +3,27 @@ import plotly.express as px
 from dash import Dash, dcc, html, Input, Output, State
 import plotly.graph_objects as go
 import json
-
-#Prepare datasets
-organizations = pd.read_csv("organizations.csv")              
-skills = pd.read_csv("volunteer_skills_breakdown.csv")       
-fund = pd.read_csv("budget_vs_actual.csv")
-volunteer = pd.read_csv("volunteer_count.csv")
-hours = pd.read_csv("service_hours.csv")
-programs = pd.read_csv("programs_by_year.csv")
-location = pd.read_csv("project_locations.csv")
-evaluation = pd.read_csv("project_evaluation.csv")
+import os
+import hashlib
+import dash
+from flask import request
+from flask_compress import Compress
+
+#Prepare datasets (every file read here feeds DATA_VERSION below)
+DATA_FILES = []
+
+def read_data(path):
+    DATA_FILES.append(path)
+    return pd.read_csv(path)
+
+organizations = read_data("organizations.csv")              
+skills = read_data("volunteer_skills_breakdown.csv")       
+fund = read_data("budget_vs_actual.csv")
+volunteer = read_data("volunteer_count.csv")
+hours = read_data("service_hours.csv")
+programs = read_data("programs_by_year.csv")
+location = read_data("project_locations.csv")
+evaluation = read_data("project_evaluation.csv")
 
 #Dropdown for choosing organization 1: 
 merged_skills = pd.merge(
@@ -80,10 +91,87 @@ orgs_unique = organizations.drop_duplicates("org_id").sort_values("name")
 #project_evaluation:
 evaluation["score"] = pd.to_numeric(evaluation["score"], errors="coerce").fillna(0)
 
+#snapshot version: changes whenever any csv, this file or the dash release changes
+#(Render also exposes the deployed commit, which covers everything else in the repo)
+def data_version(paths):
+    h = hashlib.sha1()
+    for p in paths:
+        with open(p, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+def code_version():
+    h = hashlib.sha1()
+    with open(__file__, "rb") as f:
+        h.update(f.read())
+    h.update(dash.__version__.encode())
+    h.update(os.environ.get("RENDER_GIT_COMMIT", "").encode())
+    return h.hexdigest()[:16]
+
+DATA_VERSION = data_version(DATA_FILES)
+CODE_VERSION = code_version()
+
 app = Dash(__name__)
 
 server = app.server
 
+#compression: brotli first, gzip fallback, skip small responses
+server.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+server.config["COMPRESS_MIN_SIZE"] = 1024
+server.config["COMPRESS_MIMETYPES"] = ["text/html", "text/css", "application/javascript", "application/json"]
+Compress(server)
+
+#http caching:
+#- the layout (GET) gets an ETag and is revalidated on every load, so unchanged
+#  data and code are answered with 304 without resending the embedded stores.
+#- callbacks (POST) are pure functions of the csv data and the request payload. They
+#  get an ETag and a short max-age for a reverse proxy that is configured to cache
+#  POST keyed on the body (nginx: proxy_cache_methods POST;
+#  proxy_cache_key "$request_uri|$request_body";). Browsers never revalidate POST,
+#  so If-None-Match is only evaluated for GET/HEAD.
+CALLBACK_MAX_AGE = 60
+
+def request_etag():
+    if request.path.endswith("_dash-layout") and request.method in ("GET", "HEAD"):
+        return f"layout-{CODE_VERSION}-{DATA_VERSION}"
+    if request.path.endswith("_dash-update-component") and request.method == "POST":
+        body = hashlib.sha1(request.get_data(cache=True)).hexdigest()[:16]
+        return f"cb-{CODE_VERSION}-{DATA_VERSION}-{body}"
+    return None
+
+def matching_etag(tag):
+    # Flask-Compress sends "tag:br"/"tag:gzip"; only match a suffix the client still accepts,
+    # and return the tag as sent so the 304 carries the same ETag as the stored 200
+    for sent in request.if_none_match.as_set(include_weak=True):
+        base, _, encoding = sent.partition(":")
+        if base == tag and (not encoding or encoding in request.accept_encodings):
+            return sent
+    return None
+
+@server.before_request
+def not_modified():
+    if request.method not in ("GET", "HEAD"):
+        return None
+    tag = request_etag()
+    sent = matching_etag(tag) if tag else None
+    if sent:
+        resp = server.response_class(status=304)
+        resp.set_etag(sent)
+        return resp
+
+@server.after_request
+def add_cache_headers(resp):
+    tag = request_etag()
+    if tag is None or resp.status_code not in (200, 304):
+        return resp
+    if resp.status_code == 200:
+        resp.set_etag(tag)
+    if tag.startswith("layout-"):
+        resp.headers["Cache-Control"] = "no-cache"
+    else:
+        resp.headers["Cache-Control"] = f"public, max-age={CALLBACK_MAX_AGE}"
+    return resp
+
 PAGE = {
     "fontFamily": "Arial, sans-serif",
     "background": "#f7f9f7",
@@ -4,16 +4,183 @@ from dash import Dash, html, dcc
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
+import os
+import io
+import copy
+import fcntl
+import pickle
+import threading
 from plotly.subplots import make_subplots
 
 app = Dash(__name__)
 
 server = app.server
 
-tips = pd.read_csv('RestaurantTips.csv')
+TIPS_PATH = 'RestaurantTips.csv'
+CACHE_PATH = os.environ.get("TIPS_CACHE", ".tips_cache.pkl")  # shared by all workers
+MAX_POINTS_PER_FACET = 5000   # reservoir size per day/time panel
+GRID_BINS = 40                # grid cells per axis; each occupied cell keeps one point
+TAIL_WINDOW = 1 << 16         # bytes before the read offset checked for in-place edits
 
-def make_correlation_heatmap():
-    tips_cor = tips.corr(numeric_only=True)
+# Running pairwise-complete correlation (same numbers as DataFrame.corr()).
+class CorrelationAccumulator:
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = np.zeros((k, k))
+        self.mean_a = np.zeros((k, k))   # mean of column i where i and j are both present
+        self.m2_a = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+
+    def update(self, df):
+        x = df[self.columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        if len(x) == 0:
+            return
+        present = ~np.isnan(x)
+        w = present.astype(float)
+        # shift by the batch mean to keep the raw sums small
+        counts = w.sum(axis=0)
+        shift = np.where(counts > 0, np.where(present, x, 0.0).sum(axis=0) / np.maximum(counts, 1), 0.0)
+        x0 = np.where(present, x - shift, 0.0)
+
+        n2 = w.T @ w
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean2 = np.where(n2 > 0, (x0.T @ w) / n2, 0.0)
+        m2_2 = (x0 ** 2).T @ w - n2 * mean2 ** 2
+        comoment2 = x0.T @ x0 - n2 * mean2 * mean2.T
+        mean2 = mean2 + shift[:, None]
+
+        n1 = self.n
+        total = n1 + n2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factor = np.where(total > 0, n1 * n2 / total, 0.0)
+            weight = np.where(total > 0, n2 / total, 0.0)
+        delta = mean2 - self.mean_a
+        self.comoment = self.comoment + comoment2 + delta * delta.T * factor
+        self.m2_a = self.m2_a + m2_2 + delta ** 2 * factor
+        self.mean_a = self.mean_a + delta * weight
+        self.n = total
+
+    def corr(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = self.comoment / np.sqrt(self.m2_a * self.m2_a.T)
+        return pd.DataFrame(c, index=self.columns, columns=self.columns)
+
+# Scatter sample: a reservoir per facet plus the first point seen in each grid cell.
+class ScatterSample:
+    def __init__(self, x, y, facets, cell_size):
+        self.x, self.y, self.facets = x, y, facets
+        self.cell_size = cell_size
+        self.rng = np.random.default_rng(0)
+        self.seen = {}
+        self.reservoir = {}
+        self.cells = None
+        self.rows = 0
+
+    def update(self, df):
+        df = df.assign(_row=np.arange(self.rows, self.rows + len(df)))
+        self.rows += len(df)
+        for key, rows in df.groupby(self.facets, sort=False):
+            seen = self.seen.get(key, 0)
+            idx = np.arange(seen, seen + len(rows))
+            slot = np.where(idx < MAX_POINTS_PER_FACET, idx, self.rng.integers(0, idx + 1))
+            keep = slot < MAX_POINTS_PER_FACET
+            picked = rows[keep].assign(_slot=slot[keep]).drop_duplicates("_slot", keep="last").set_index("_slot")
+            if key in self.reservoir:
+                picked = pd.concat([self.reservoir[key].drop(picked.index, errors="ignore"), picked])
+            self.reservoir[key] = picked
+            self.seen[key] = seen + len(rows)
+
+        keys = self.facets + ["_cx", "_cy"]
+        firsts = df.assign(
+            _cx=np.floor(pd.to_numeric(df[self.x], errors="coerce") / self.cell_size[0]),
+            _cy=np.floor(pd.to_numeric(df[self.y], errors="coerce") / self.cell_size[1]),
+        ).dropna(subset=keys).drop_duplicates(keys)
+        self.cells = firsts if self.cells is None else pd.concat([self.cells, firsts]).drop_duplicates(keys)
+
+    def frame(self):
+        return pd.concat(list(self.reservoir.values()) + [self.cells]).drop_duplicates("_row")
+
+def grid_cell_size(df, x, y):
+    spans = [(df[c].max() - df[c].min()) / GRID_BINS for c in (x, y)]
+    return tuple(s if s > 0 else 1.0 for s in spans)
+
+# The built figures and the running state live in CACHE_PATH, keyed by the csv's
+# inode/size/mtime: one worker refreshes it under a file lock, the others just load it.
+# Appended rows are parsed from the saved byte offset; anything else is a full reload.
+local = {"signature": None, "figures": None}
+local_lock = threading.Lock()
+
+def file_signature(path):
+    st = os.stat(path)
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+def load_state():
+    try:
+        with open(CACHE_PATH, "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+def save_state(state):
+    tmp = f"{CACHE_PATH}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(state, f)
+    os.replace(tmp, CACHE_PATH)
+
+def is_append(state, signature):
+    if state is None or not state["complete"] or state["ino"] != signature[0] or signature[1] < state["offset"]:
+        return False
+    start = state["offset"] - len(state["tail"])
+    with open(TIPS_PATH, "rb") as f:
+        f.seek(start)
+        return f.read(len(state["tail"])) == state["tail"]
+
+def build_state(state, signature):
+    if is_append(state, signature):
+        with open(TIPS_PATH, "rb") as f:
+            f.seek(state["offset"])
+            data = f.read()
+        data = data[:data.rfind(b"\n") + 1]   # leave a half-written last row for next time
+        stats, sample = copy.deepcopy(state["stats"]), copy.deepcopy(state["sample"])
+        if data:
+            new_rows = pd.read_csv(io.BytesIO(data), header=None, names=state["columns"])
+            stats.update(new_rows)
+            sample.update(new_rows)
+        columns, offset, tail = state["columns"], state["offset"] + len(data), state["tail"] + data
+        complete = True
+    else:
+        with open(TIPS_PATH, "rb") as f:
+            data = f.read()
+        tips = pd.read_csv(io.BytesIO(data))
+        stats = CorrelationAccumulator(tips.select_dtypes("number").columns)
+        sample = ScatterSample("total_bill", "tip", ["day", "time"], grid_cell_size(tips, "total_bill", "tip"))
+        stats.update(tips)
+        sample.update(tips)
+        columns, offset, tail = list(tips.columns), len(data), data
+        complete = data.endswith(b"\n")   # otherwise the last row may still grow: reload next time
+
+    figures = (make_correlation_heatmap(stats), make_scatter_plot(sample.frame()))
+    return {"signature": signature, "ino": signature[0], "offset": offset, "tail": tail[-TAIL_WINDOW:],
+            "complete": complete, "columns": columns, "stats": stats, "sample": sample, "figures": figures}
+
+def refresh_cache():
+    signature = file_signature(TIPS_PATH)
+    with local_lock:
+        if local["signature"] == signature:
+            return local["figures"]
+        with open(CACHE_PATH + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            state = load_state()
+            if state is None or state["signature"] != signature:
+                state = build_state(state, signature)
+                save_state(state)
+        local.update(signature=signature, figures=state["figures"])
+        return state["figures"]
+
+def make_correlation_heatmap(stats):
+    tips_cor = stats.corr()
 
     fig = px.imshow(
     tips_cor, 
@@ -25,7 +192,7 @@ def make_correlation_heatmap():
 
     return fig
 
-def make_scatter_plot():
+def make_scatter_plot(tips):
     fig = px.scatter(
         tips, 
         x="total_bill", 
@@ -37,14 +204,17 @@ def make_scatter_plot():
         facet_row = "time", 
         labels={"sex": "Gender", "smoker": "Smokes"},
         category_orders={"day": ["Thur", "Fri", "Sat", "Sun"],
-        "time": ["Lunch", "Dinner"]})
+        "time": ["Lunch", "Dinner"]},
+        render_mode="webgl")
 
     fig.update_xaxes(title_text = "Total Bill ($)")
     fig.update_yaxes(title_text = "Tips ($)")
 
     return fig
 
-app.layout = html.Div(children=[
+def serve_layout():
+    correlation_fig, scatter_fig = refresh_cache()
+    return html.Div(children=[
     html.H1(children = "Restaurant Tips Exploratory Data Analysis", style={
         "textAlign": "center",
         "font-size": "70px",
@@ -67,7 +237,7 @@ app.layout = html.Div(children=[
     }),
     dcc.Graph(
         id='correlation_graph',
-        figure=make_correlation_heatmap()
+        figure=correlation_fig
         ),
         
         
@@ -80,10 +250,14 @@ app.layout = html.Div(children=[
         "-webkit-background-clip": "text",
     }),
     dcc.Graph(id='scatter_graph',
-        figure=make_scatter_plot()
+        figure=scatter_fig
     ),
 ])
 
+# a static skeleton stops Dash from calling serve_layout (and reading the csv) at import
+app.validation_layout = html.Div([dcc.Graph(id='correlation_graph'), dcc.Graph(id='scatter_graph')])
+app.layout = serve_layout
+
 # Start the server
 if __name__ == '__main__':
     app.run_server(debug=True)